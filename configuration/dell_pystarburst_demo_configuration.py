@@ -10,6 +10,49 @@ BASE_CONFIG = 'BASE'                                          # Base Configurati
 DELL_S3_CONNECTION = 'DELL_S3_CONNECTION'                     # Dell OBS S3 Configuration Section
 DDAE_SESSION = 'DDAE_SESSION'                                 # DDAE Session Configuration Section
 DDAE_DATA_CONFIG = 'DDAE_DATA_CONFIG'                         # Iceberg Configuration Section
+DDAE_ICEBERG_MAINTENANCE = 'DDAE_ICEBERG_MAINTENANCE'         # Iceberg Table Maintenance Configuration Section
+DDAE_ICEBERG_MIGRATION = 'DDAE_ICEBERG_MIGRATION'             # Hive to Iceberg Migration Configuration Section
+DDAE_WRITE_CONFIG = 'DDAE_WRITE_CONFIG'                       # DataFrame Write Configuration Section
+MULTI_TENANT = 'MULTI_TENANT'                                 # Multi-Tenant Scenario Runner Configuration Section
+
+# Default number of seconds a controlled shutdown waits for in-flight work to be cancelled
+DEFAULT_SHUTDOWN_DRAIN_TIMEOUT = "30"
+
+# Iceberg table maintenance defaults, used when the optional section or a value is not configured
+DEFAULT_ICEBERG_MAINTENANCE = {
+    "optimize_file_size_threshold_mb": "128",
+    "optimize_min_small_files": "50",
+    "expire_snapshots_retention_days": "7",
+    "expire_snapshots_min_count": "1",
+    "remove_orphan_files_retention_days": "7"
+}
+
+# Iceberg table maintenance runner defaults, no tables means the migration's Iceberg table and no interval means run once
+DEFAULT_ICEBERG_MAINTENANCE_RUNNER = {
+    "maintenance_tables": "",
+    "maintenance_interval_hours": "0"
+}
+
+# Hive to Iceberg migration defaults, used when the optional section is configured but a value is not
+DEFAULT_ICEBERG_MIGRATION = {
+    "migration_partition_column": "",
+    "migration_key_column": "",
+    "migration_batch_count": "8",
+    "migration_max_workers": "4"
+}
+
+# DataFrame write defaults, used when the optional section or a value is not configured
+DEFAULT_WRITE_CONFIG = {
+    "write_target_batch_bytes": "524288",
+    "write_max_batch_rows": "50000",
+    "write_max_workers": "4"
+}
+
+# Multi-tenant scenario runner defaults, used when the optional section or a value is not configured
+DEFAULT_MULTI_TENANT = {
+    "tenant_count": "2",
+    "max_workers": "2"
+}
 
 
 class InvalidConfigurationException(Exception):
@@ -53,10 +96,35 @@ class DellPyStarburstDemoConfiguration(object):
         self.ddae_table_schema_customer = parser[DDAE_DATA_CONFIG]['ddae_table_schema_customer']
         self.dell_lakehouse_s3_bucket = parser[DDAE_DATA_CONFIG]['dell_lakehouse_s3_bucket']
 
+        # Grab Iceberg Table Maintenance Configuration (optional section)
+        self.ddae_iceberg_maintenance = dict(DEFAULT_ICEBERG_MAINTENANCE)
+        self.ddae_iceberg_maintenance.update(DEFAULT_ICEBERG_MAINTENANCE_RUNNER)
+        self.ddae_iceberg_maintenance.update(parser.get(DDAE_ICEBERG_MAINTENANCE, {}))
+
+        # Grab DataFrame Write Configuration (optional section)
+        self.ddae_write_config = dict(DEFAULT_WRITE_CONFIG)
+        self.ddae_write_config.update(parser.get(DDAE_WRITE_CONFIG, {}))
+
+        # Grab Multi-Tenant Scenario Runner Configuration (optional section)
+        self.multi_tenant = dict(DEFAULT_MULTI_TENANT)
+        self.multi_tenant.update(parser.get(MULTI_TENANT, {}))
+
+        # Grab Hive to Iceberg Migration Configuration (optional section, migration is skipped when not present)
+        self.ddae_iceberg_migration = None
+        if DDAE_ICEBERG_MIGRATION in parser:
+            self.ddae_iceberg_migration = dict(DEFAULT_ICEBERG_MIGRATION)
+            self.ddae_iceberg_migration.update(parser[DDAE_ICEBERG_MIGRATION])
+
         # Set logging level
         logging_level_raw = parser[BASE_CONFIG]['logging_level']
         self.logging_level = logging.getLevelName(logging_level_raw.upper())
 
+        # Set controlled shutdown drain timeout (optional)
+        shutdown_drain_timeout_raw = str(parser[BASE_CONFIG].get('shutdown_drain_timeout', DEFAULT_SHUTDOWN_DRAIN_TIMEOUT))
+        if not shutdown_drain_timeout_raw.isdigit():
+            raise InvalidConfigurationException("The shutdown drain timeout must be a whole number of seconds")
+        self.shutdown_drain_timeout = int(shutdown_drain_timeout_raw)
+
         # Validate logging level
         if logging_level_raw not in ['debug', 'info', 'warning', 'error']:
             raise InvalidConfigurationException(
@@ -134,4 +202,46 @@ class DellPyStarburstDemoConfiguration(object):
         if not self.dell_lakehouse_s3_bucket:
             raise InvalidConfigurationException("The Dell Lakehouse S3 Bucket is not configured in the module configuration")
 
-
+        # Validate Iceberg Table Maintenance Configuration
+        for maintenance_key in DEFAULT_ICEBERG_MAINTENANCE:
+            maintenance_value = str(self.ddae_iceberg_maintenance[maintenance_key])
+            if not maintenance_value.isdigit() or int(maintenance_value) < 1:
+                raise InvalidConfigurationException("The Iceberg maintenance setting " + maintenance_key +
+                                                    " must be a positive whole number")
+        if not str(self.ddae_iceberg_maintenance['maintenance_interval_hours']).isdigit():
+            raise InvalidConfigurationException("The Iceberg maintenance setting maintenance_interval_hours must be a "
+                                                "whole number")
+        for maintenance_table in str(self.ddae_iceberg_maintenance['maintenance_tables']).split(','):
+            if maintenance_table.strip() and len(maintenance_table.strip().split('.')) != 3:
+                raise InvalidConfigurationException("The Iceberg maintenance table " + maintenance_table.strip() +
+                                                    " must be given as catalog.schema.table")
+
+        # Validate DataFrame Write Configuration
+        for write_key in DEFAULT_WRITE_CONFIG:
+            write_value = str(self.ddae_write_config[write_key])
+            if not write_value.isdigit() or int(write_value) < 1:
+                raise InvalidConfigurationException("The DataFrame write setting " + write_key +
+                                                    " must be a positive whole number")
+
+        # Validate Multi-Tenant Scenario Runner Configuration
+        for tenant_key in DEFAULT_MULTI_TENANT:
+            tenant_value = str(self.multi_tenant[tenant_key])
+            if not tenant_value.isdigit() or int(tenant_value) < 1:
+                raise InvalidConfigurationException("The multi-tenant setting " + tenant_key +
+                                                    " must be a positive whole number")
+        if int(self.multi_tenant['tenant_count']) > 999:
+            raise InvalidConfigurationException("The multi-tenant tenant_count can not be greater than 999")
+
+        # Validate Hive to Iceberg Migration Configuration
+        if self.ddae_iceberg_migration is not None:
+            if not self.ddae_iceberg_migration.get('ddae_iceberg_catalog'):
+                raise InvalidConfigurationException("The Iceberg migration catalog is not configured in the module configuration")
+            if not self.ddae_iceberg_migration.get('ddae_iceberg_schema'):
+                raise InvalidConfigurationException("The Iceberg migration schema is not configured in the module configuration")
+            if not self.ddae_iceberg_migration.get('ddae_iceberg_table_location'):
+                raise InvalidConfigurationException("The Iceberg migration table location is not configured in the module configuration")
+            for migration_key in ['migration_batch_count', 'migration_max_workers']:
+                migration_value = str(self.ddae_iceberg_migration[migration_key])
+                if not migration_value.isdigit() or int(migration_value) < 1:
+                    raise InvalidConfigurationException("The Iceberg migration setting " + migration_key +
+                                                        " must be a positive whole number")
@@ -0,0 +1,16 @@
+"""
+DELL Data Analytics Engine - Checkpoint Files.
+"""
+import json
+import os
+
+
+def write_checkpoint_file(checkpoint_path, checkpoint):
+    """
+    Write the checkpoint to a JSON file
+    """
+    # Write to a temporary file and rename it so an interrupted write never corrupts the checkpoint
+    os.makedirs(os.path.dirname(checkpoint_path), exist_ok=True)
+    with open(checkpoint_path + '.tmp', 'w') as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(checkpoint_path + '.tmp', checkpoint_path)
@@ -1,10 +1,15 @@
 """
 DELL Data Analytics Engine - Starburst.
 """
+import threading
+import time
 import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
 import trino
 from pystarburst import Session
+from pystarburst.functions import col
 from pystarburst.types import IntegerType, StringType, StructField, StructType, TimestampType, DoubleType, BooleanType, \
     ArrayType
 
@@ -30,7 +35,7 @@ class DDAEAuthentication(object):
     Stores DDAE Session Information
     """
 
-    def __init__(self, protocol, host, username, password, port, catalog, schema, logger):
+    def __init__(self, protocol, host, username, password, port, catalog, schema, logger, source=None):
         self.protocol = protocol
         self.host = host
         self.port = port
@@ -43,6 +48,9 @@ class DDAEAuthentication(object):
         self.url = "{0}://{1}:{2}".format(self.protocol, self.host, self.port)
         self.sep_session = ''
 
+        # Queries are tagged with the source so they can be found and cancelled on the coordinator
+        self.source = source if source else 'dell-pystarburst-demo-' + uuid.uuid4().hex[:12]
+
         # Disable warnings
         # urllib3.disable_warnings()
 
@@ -58,6 +66,15 @@ class DDAEAuthentication(object):
         """
         return self.sep_session
 
+    def clone(self, source=None):
+        """
+        Returns a new, not yet connected, session object with the same connection details so
+        concurrent workers can each run queries on their own session.  Clones share the source
+        unless another one is given so cancel_queries() also cancels the queries of every clone.
+        """
+        return DDAEAuthentication(self.protocol, self.host, self.username, self.password, self.port,
+                                  self.catalog, self.schema, self.logger, source if source else self.source)
+
     def connect(self):
         """
         Connect to DDAE and generate a session object
@@ -69,6 +86,7 @@ class DDAEAuthentication(object):
                 "http_scheme": self.protocol,
                 "verify": False,
                 "roles": {"system": "ROLE{sysadmin}"},
+                "source": self.source,
                 "auth": trino.auth.BasicAuthentication(self.username, self.password)
             }
         else:
@@ -77,6 +95,7 @@ class DDAEAuthentication(object):
                 "port": self.port,
                 "http_scheme": self.protocol,
                 "roles": {"system": "ROLE{sysadmin}"},
+                "source": self.source,
                 "user": self.username
             }
 
@@ -117,16 +136,54 @@ class DDAEAuthentication(object):
             self.logger.error('DDAEAuthentication::disconnect()::The following unexpected '
                               'exception occurred: ' + str(e) + "\n" + traceback.format_exc())
 
+    def cancel_queries(self):
+        """
+        Kill every query still running on the coordinator that was started by this session or its clones
+        and return the number of queries killed
+        """
+        cancelled = 0
+
+        # The queries are killed from a separate session since this one may be blocked waiting on a query
+        drain_session = self.clone(self.source + '-drain')
+        drain_session.connect()
+        if drain_session.sep_session is None:
+            return cancelled
+
+        try:
+            sqlString = ("SELECT query_id FROM system.runtime.queries "
+                         "WHERE source = '{0}' AND state NOT IN ('FINISHED', 'FAILED')").format(self.source)
+            for row in drain_session.sep_session.sql(sqlString).collect():
+                self.logger.info('DDAEAuthentication::cancel_queries()::Killing query ' + row[0])
+                sqlString2 = ("CALL system.runtime.kill_query(query_id => '{0}', "
+                              "message => 'Cancelled by controlled shutdown')").format(row[0])
+                try:
+                    drain_session.sep_session.sql(sqlString2).collect()
+                    cancelled += 1
+                except Exception as e:
+                    # The query may have finished between listing and killing it
+                    self.logger.warning('DDAEAuthentication::cancel_queries()::Unable to kill query ' + row[0] +
+                                        ': ' + str(e))
+
+        except Exception as e:
+            self.logger.error('DDAEAuthentication::cancel_queries()::The following unexpected '
+                              'exception occurred: ' + str(e) + "\n" + traceback.format_exc())
+
+        finally:
+            drain_session.disconnect()
+
+        return cancelled
+
 
 class DDAEDataProcessor(object):
     """
     Perform Data Operations against DDAE/Starburst
     """
 
-    def __init__(self, configuration, sepsession, logger):
+    def __init__(self, configuration, sepsession, logger, shutdown=None):
         self.configuration = configuration
         self.sepsession = sepsession
         self.logger = logger
+        self.shutdown = shutdown
         self.response_xml_file = None
 
     def create_ddae_hive_table(self, catalog, schema, table_name, table_location, table_columns):
@@ -197,6 +254,23 @@ class DDAEDataProcessor(object):
             self.logger.error('DDAEDataProcessor::create_table()::The following unexpected '
                               'exception occurred: ' + str(e) + "\n" + traceback.format_exc())
 
+    def ddae_table_exists(self, catalog, schema, table_name):
+        """
+        Returns True if the table exists in the catalog and schema.  Query errors are raised rather than
+        reported as a missing table so callers can tell the two apart
+        """
+        sqlString = ("SELECT count(*) FROM {0}.information_schema.tables "
+                     "WHERE table_schema = '{1}' AND table_name = '{2}'").format(catalog, schema, table_name)
+        return int(self.sepsession.sep_session.sql(sqlString).collect()[0][0]) > 0
+
+    def ddae_schema_exists(self, catalog, schema):
+        """
+        Returns True if the schema exists in the catalog
+        """
+        sqlString = ("SELECT count(*) FROM {0}.information_schema.schemata "
+                     "WHERE schema_name = '{1}'").format(catalog, schema)
+        return int(self.sepsession.sep_session.sql(sqlString).collect()[0][0]) > 0
+
     def get_list_of_catalogs(self):
         try:
             # Create the schema and table to store the Dell Object Log Data
@@ -276,3 +350,154 @@ class DDAEDataProcessor(object):
         except Exception as e:
             self.logger.error('DDAEDataProcessor::print_table_data()::The following unexpected '
                               'exception occurred: ' + str(e) + "\n" + traceback.format_exc())
+
+    def write_ddae_table_data(self, catalog, schema, table_name, data):
+        """
+        Append pandas DataFrames, Arrow tables / record batches, or an iterable of either to a table
+
+        Data is written with batched INSERTs through PyStarburst DataFrame writes.  Rows per batch are sized from
+        the data to stay near the configured write_target_batch_bytes and batches are written concurrently, each
+        worker on its own session, with at most write_max_workers batches in flight.  Returns a summary of the
+        rows, batches, and rows per second written.  Raises DDAEException when the data does not contain every
+        column of the table since the rows would otherwise be written into the wrong columns.
+        """
+        full_table_name = catalog + '.' + schema + '.' + table_name
+        target_batch_bytes = int(self.configuration.ddae_write_config['write_target_batch_bytes'])
+        max_batch_rows = int(self.configuration.ddae_write_config['write_max_batch_rows'])
+        max_workers = int(self.configuration.ddae_write_config['write_max_workers'])
+        summary = {'table': full_table_name, 'rows': 0, 'batches': 0, 'failed': 0, 'cancelled': False, 'seconds': 0.0,
+                   'rows_per_second': 0.0}
+
+        self.logger.info(
+            'DDAEDataProcessor::write_ddae_table_data()::Writing data to the following table: ' + full_table_name)
+
+        worker_state = threading.local()
+        worker_sessions = []
+        sessions_lock = threading.Lock()
+        in_flight = threading.BoundedSemaphore(max_workers)
+        start_time = time.monotonic()
+
+        def write_batch(batch_rows, batch_columns):
+            try:
+                if self.is_shutdown_requested():
+                    raise DDAEException('Cancelled by controlled shutdown')
+
+                # Each worker thread writes on its own session
+                if getattr(worker_state, 'session', None) is None:
+                    worker_state.session = self.sepsession.clone()
+                    worker_state.session.connect()
+                    with sessions_lock:
+                        worker_sessions.append(worker_state.session)
+
+                # Column types are inferred from the Python values, e.g. an integer column with nulls arrives as
+                # double, so every column is cast to the table's type before the INSERT
+                df_batch = worker_state.session.sep_session.create_dataframe(batch_rows, schema=batch_columns)
+                df_batch = df_batch.select([col(column).cast(field.datatype)
+                                            for column, field in zip(batch_columns, table_fields)])
+                df_batch.write.save_as_table(full_table_name, mode='append')
+                return len(batch_rows)
+            finally:
+                in_flight.release()
+
+        try:
+            # Writes are matched to the table by position so the data is put in the table's column order
+            table_fields = self.sepsession.sep_session.table(full_table_name).schema.fields
+            table_columns = [field.name.lower() for field in table_fields]
+
+            futures = []
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                batch_size = None
+                for pd_chunk in self.get_pandas_chunks(data):
+                    if self.is_shutdown_requested():
+                        break
+                    if len(pd_chunk) == 0:
+                        continue
+
+                    # Writes are positional so refuse data that does not name every column of the table exactly once.
+                    # rename returns a copy so the caller's DataFrame keeps its column names.
+                    pd_chunk = pd_chunk.rename(columns=lambda column: str(column).lower())
+                    duplicate_columns = list(pd_chunk.columns[pd_chunk.columns.duplicated()].unique())
+                    if duplicate_columns:
+                        raise DDAEException('The data written to ' + full_table_name + ' has columns that differ only '
+                                            'by case: ' + ', '.join(duplicate_columns))
+                    missing_columns = [column for column in table_columns if column not in pd_chunk.columns]
+                    if missing_columns:
+                        raise DDAEException('The data written to ' + full_table_name + ' is missing the following '
+                                            'columns: ' + ', '.join(missing_columns))
+                    pd_chunk = pd_chunk[table_columns]
+
+                    # Size batches from the first chunk using its CSV encoding as an estimate of the INSERT size
+                    if batch_size is None:
+                        pd_sample = pd_chunk.head(100)
+                        row_bytes = max(1, len(pd_sample.to_csv(index=False, header=False)) // len(pd_sample))
+                        batch_size = max(1, min(max_batch_rows, target_batch_bytes // row_bytes))
+                        self.logger.info(
+                            'DDAEDataProcessor::write_ddae_table_data()::Writing batches of ' + str(batch_size) +
+                            ' rows (about ' + str(row_bytes) + ' bytes per row) with ' + str(max_workers) + ' workers')
+
+                    # Replace NaN / NaT with None so missing values are written as NULL
+                    pd_chunk = pd_chunk.astype(object).where(pd_chunk.notna(), None)
+                    for batch_start in range(0, len(pd_chunk), batch_size):
+                        # Stop scheduling batches once a shutdown has been requested
+                        if self.is_shutdown_requested():
+                            self.logger.info('DDAEDataProcessor::write_ddae_table_data()::Controlled shutdown '
+                                             'requested, no further batches will be written')
+                            break
+                        batch_rows = pd_chunk.iloc[batch_start:batch_start + batch_size].values.tolist()
+                        # Block until a worker is free so generators are not read faster than batches are written
+                        in_flight.acquire()
+                        futures.append(executor.submit(write_batch, batch_rows, list(pd_chunk.columns)))
+
+            for future in futures:
+                summary['batches'] += 1
+                try:
+                    summary['rows'] += future.result()
+                except Exception as e:
+                    summary['failed'] += 1
+                    self.logger.error('DDAEDataProcessor::write_ddae_table_data()::The following unexpected '
+                                      'exception occurred writing a batch: ' + str(e))
+
+        except DDAEException as e:
+            self.logger.error('DDAEDataProcessor::write_ddae_table_data()::' + str(e))
+            raise
+
+        except Exception as e:
+            self.logger.error('DDAEDataProcessor::write_ddae_table_data()::The following unexpected '
+                              'exception occurred: ' + str(e) + "\n" + traceback.format_exc())
+
+        finally:
+            for worker_session in worker_sessions:
+                if worker_session.sep_session is not None:
+                    worker_session.disconnect()
+
+        summary['cancelled'] = self.is_shutdown_requested()
+        summary['seconds'] = round(time.monotonic() - start_time, 3)
+        if summary['seconds'] > 0:
+            summary['rows_per_second'] = round(summary['rows'] / summary['seconds'], 1)
+
+        self.logger.info(
+            'DDAEDataProcessor::write_ddae_table_data()::Write complete:\n' +
+            tabulate([summary], headers='keys', tablefmt='psql'))
+
+        return summary
+
+    def is_shutdown_requested(self):
+        return self.shutdown is not None and self.shutdown.kill_now
+
+    @staticmethod
+    def get_pandas_chunks(data):
+        """
+        Yields pandas DataFrames from a pandas DataFrame, an Arrow table or record batch, or an iterable of them
+        """
+        if isinstance(data, pd.DataFrame):
+            yield data
+        elif hasattr(data, 'to_pandas'):
+            yield data.to_pandas()
+        else:
+            for chunk in data:
+                if isinstance(chunk, pd.DataFrame):
+                    yield chunk
+                elif hasattr(chunk, 'to_pandas'):
+                    yield chunk.to_pandas()
+                else:
+                    raise DDAEException('Unsupported data type for write: ' + type(chunk).__name__)
@@ -0,0 +1,143 @@
+"""
+DELL Data Analytics Engine - Starburst Iceberg Table Maintenance.
+"""
+import traceback
+
+from tabulate import tabulate
+
+BYTES_PER_MB = 1024 * 1024
+
+
+class DDAEIcebergMaintenance(object):
+    """
+    Perform Iceberg table maintenance (optimize, expire_snapshots, and remove_orphan_files) against DDAE/Starburst
+
+    Each procedure is only executed when the table's $files and $snapshots metadata tables show it is needed
+    based on the thresholds in the DDAE_ICEBERG_MAINTENANCE configuration section.
+    """
+
+    def __init__(self, configuration, sepsession, logger, shutdown=None):
+        self.configuration = configuration
+        self.sepsession = sepsession
+        self.logger = logger
+        self.shutdown = shutdown
+
+        # Grab maintenance thresholds
+        maintenance = configuration.ddae_iceberg_maintenance
+        self.optimize_file_size_threshold_mb = int(maintenance['optimize_file_size_threshold_mb'])
+        self.optimize_min_small_files = int(maintenance['optimize_min_small_files'])
+        self.expire_snapshots_retention_days = int(maintenance['expire_snapshots_retention_days'])
+        self.expire_snapshots_min_count = int(maintenance['expire_snapshots_min_count'])
+        self.remove_orphan_files_retention_days = int(maintenance['remove_orphan_files_retention_days'])
+
+    def maintain_ddae_iceberg_table(self, catalog, schema, table_name):
+        """
+        Run the maintenance procedures that are needed for the table and return a report of the
+        data files and bytes before and after maintenance along with the procedures that were executed
+        """
+        full_table_name = catalog + '.' + schema + '.' + table_name
+        report = {'table': full_table_name, 'actions': [], 'cancelled': False}
+
+        self.logger.info(
+            'DDAEIcebergMaintenance::maintain_ddae_iceberg_table()::Starting maintenance of the following table: ' + full_table_name)
+        try:
+            if self.is_shutdown_requested(report):
+                return report
+            report['files_before'], report['bytes_before'] = self.get_file_statistics(catalog, schema, table_name)
+
+            # Compact small files if there are enough of them to make a rewrite worthwhile
+            small_files = self.get_small_file_count(catalog, schema, table_name)
+            if small_files >= self.optimize_min_small_files:
+                if self.is_shutdown_requested(report):
+                    return report
+                sqlString = "ALTER TABLE {0}.{1}.{2} EXECUTE optimize(file_size_threshold => '{3}MB')".format(
+                    catalog, schema, table_name, self.optimize_file_size_threshold_mb)
+                self.execute_procedure('optimize', sqlString)
+                report['actions'].append('optimize')
+            else:
+                self.logger.info(
+                    'DDAEIcebergMaintenance::maintain_ddae_iceberg_table()::Skipping optimize, ' + str(small_files) +
+                    ' data files are smaller than ' + str(self.optimize_file_size_threshold_mb) + 'MB')
+
+            # Expire old snapshots and then remove the files that are no longer referenced by any snapshot.  Orphan
+            # files can not be found from the metadata tables so remove_orphan_files runs together with expire_snapshots
+            if self.is_shutdown_requested(report):
+                return report
+            expired_snapshots = self.get_expired_snapshot_count(catalog, schema, table_name)
+            if expired_snapshots >= self.expire_snapshots_min_count:
+                if self.is_shutdown_requested(report):
+                    return report
+                sqlString = "ALTER TABLE {0}.{1}.{2} EXECUTE expire_snapshots(retention_threshold => '{3}d')".format(
+                    catalog, schema, table_name, self.expire_snapshots_retention_days)
+                self.execute_procedure('expire_snapshots', sqlString)
+                report['actions'].append('expire_snapshots')
+
+                if self.is_shutdown_requested(report):
+                    return report
+                sqlString2 = "ALTER TABLE {0}.{1}.{2} EXECUTE remove_orphan_files(retention_threshold => '{3}d')".format(
+                    catalog, schema, table_name, self.remove_orphan_files_retention_days)
+                self.execute_procedure('remove_orphan_files', sqlString2)
+                report['actions'].append('remove_orphan_files')
+            else:
+                self.logger.info(
+                    'DDAEIcebergMaintenance::maintain_ddae_iceberg_table()::Skipping expire_snapshots and remove_orphan_files, ' +
+                    str(expired_snapshots) + ' snapshots are older than ' + str(self.expire_snapshots_retention_days) + ' days')
+
+            if self.is_shutdown_requested(report):
+                return report
+            report['files_after'], report['bytes_after'] = self.get_file_statistics(catalog, schema, table_name)
+
+            self.logger.info(
+                'DDAEIcebergMaintenance::maintain_ddae_iceberg_table()::Maintenance complete for the following table: ' +
+                full_table_name + '\n' + tabulate([report], headers='keys', tablefmt='psql'))
+
+        except Exception as e:
+            self.logger.error('DDAEIcebergMaintenance::maintain_ddae_iceberg_table()::The following unexpected '
+                              'exception occurred: ' + str(e) + "\n" + traceback.format_exc())
+
+        return report
+
+    def is_shutdown_requested(self, report):
+        """
+        Returns True, and marks the report cancelled, once a controlled shutdown has been requested so no
+        further maintenance queries are started
+        """
+        if self.shutdown is not None and self.shutdown.kill_now:
+            self.logger.info('DDAEIcebergMaintenance::maintain_ddae_iceberg_table()::Controlled shutdown requested, '
+                             'stopping maintenance of the following table: ' + report['table'])
+            report['cancelled'] = True
+            return True
+        return False
+
+    def get_file_statistics(self, catalog, schema, table_name):
+        """
+        Returns the number of data files and total bytes in the current snapshot of the table
+        """
+        sqlString = "SELECT count(*), coalesce(sum(file_size_in_bytes), 0) FROM {0}.{1}.\"{2}$files\"".format(
+            catalog, schema, table_name)
+        row = self.sepsession.sep_session.sql(sqlString).collect()[0]
+        return int(row[0]), int(row[1])
+
+    def get_small_file_count(self, catalog, schema, table_name):
+        """
+        Returns the number of data files below the optimize file size threshold
+        """
+        sqlString = "SELECT count(*) FROM {0}.{1}.\"{2}$files\" WHERE file_size_in_bytes < {3}".format(
+            catalog, schema, table_name, self.optimize_file_size_threshold_mb * BYTES_PER_MB)
+        return int(self.sepsession.sep_session.sql(sqlString).collect()[0][0])
+
+    def get_expired_snapshot_count(self, catalog, schema, table_name):
+        """
+        Returns the number of snapshots older than the expire_snapshots retention threshold, not counting
+        the current snapshot since expire_snapshots always keeps it
+        """
+        sqlString = ("SELECT count(*) FROM {0}.{1}.\"{2}$snapshots\" "
+                     "WHERE committed_at < current_timestamp - INTERVAL '{3}' DAY "
+                     "AND snapshot_id <> (SELECT snapshot_id FROM {0}.{1}.\"{2}$snapshots\" "
+                     "ORDER BY committed_at DESC LIMIT 1)").format(
+            catalog, schema, table_name, self.expire_snapshots_retention_days)
+        return int(self.sepsession.sep_session.sql(sqlString).collect()[0][0])
+
+    def execute_procedure(self, procedure, sqlString):
+        self.logger.info('DDAEIcebergMaintenance::execute_procedure()::Running ' + procedure + ': ' + sqlString)
+        self.sepsession.sep_session.sql(sqlString).collect()
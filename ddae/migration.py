@@ -0,0 +1,232 @@
+"""
+DELL Data Analytics Engine - Starburst Hive to Iceberg Migration.
+"""
+import json
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from tabulate import tabulate
+
+from ddae.checkpoint import write_checkpoint_file
+from ddae.ddae import DDAEDataProcessor, DDAEException
+
+BATCH_COMPLETE = 'complete'
+BATCH_FAILED = 'failed'
+BATCH_CANCELLED = 'cancelled'
+INTEGER_TYPES = ['tinyint', 'smallint', 'integer', 'bigint']
+
+
+class DDAEHiveToIcebergMigration(object):
+    """
+    Migrate a Hive table to an Iceberg table with concurrent INSERT ... SELECT batches
+
+    The source is split into batches by partition or key range, every batch is verified by comparing
+    source and target row counts, and completed batches are checkpointed to a file in the temporary
+    file storage path so an interrupted migration resumes with the remaining batches.
+    """
+
+    def __init__(self, configuration, sepsession, logger, shutdown=None):
+        self.configuration = configuration
+        self.sepsession = sepsession
+        self.logger = logger
+        self.shutdown = shutdown
+        self.checkpoint_lock = threading.Lock()
+
+        # Grab migration settings
+        migration = configuration.ddae_iceberg_migration
+        self.partition_column = migration['migration_partition_column']
+        self.key_column = migration['migration_key_column']
+        self.batch_count = int(migration['migration_batch_count'])
+        self.max_workers = int(migration['migration_max_workers'])
+
+    def migrate_ddae_hive_table(self, source_catalog, source_schema, table_name, target_catalog, target_schema,
+                                target_location, table_columns):
+        """
+        Migrate the Hive table to Iceberg and return a summary of the batches, rows, and failures.  The summary
+        includes an error when the migration stopped before its batches could be run
+        """
+        source_table = source_catalog + '.' + source_schema + '.' + table_name
+        target_table = target_catalog + '.' + target_schema + '.' + table_name
+        summary = {'source': source_table, 'target': target_table, 'batches': 0, 'skipped': 0, 'failed': 0,
+                   'cancelled': 0, 'rows': 0}
+
+        self.logger.info(
+            'DDAEHiveToIcebergMigration::migrate_ddae_hive_table()::Migrating ' + source_table + ' to ' + target_table)
+        try:
+            # Create the Iceberg schema and table if needed
+            DDAEDataProcessor(self.configuration, self.sepsession, self.logger, self.shutdown).create_ddae_iceberg_table(
+                target_catalog, target_schema, table_name, target_location, table_columns)
+
+            # Load the checkpoint from an earlier run or plan the batches for a new migration
+            checkpoint_path = self.get_checkpoint_path(target_table)
+            checkpoint = self.load_checkpoint(checkpoint_path, source_table, target_table)
+            if checkpoint['plan'] is None:
+                checkpoint['plan'] = self.plan_batches(source_table)
+                self.save_checkpoint(checkpoint_path, checkpoint)
+
+            pending = [predicate for predicate in checkpoint['plan']
+                       if checkpoint['batches'].get(predicate, {}).get('status') != BATCH_COMPLETE]
+            summary['batches'] = len(checkpoint['plan'])
+            summary['skipped'] = summary['batches'] - len(pending)
+
+            self.logger.info(
+                'DDAEHiveToIcebergMigration::migrate_ddae_hive_table()::' + str(len(pending)) + ' of ' +
+                str(summary['batches']) + ' batches remaining with ' + str(self.max_workers) + ' workers')
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self.migrate_batch, source_table, target_table, predicate): predicate
+                           for predicate in pending}
+                for future in as_completed(futures):
+                    result = future.result()
+                    with self.checkpoint_lock:
+                        checkpoint['batches'][futures[future]] = result
+                        self.save_checkpoint(checkpoint_path, checkpoint)
+
+            for batch in checkpoint['batches'].values():
+                if batch['status'] == BATCH_COMPLETE:
+                    summary['rows'] += batch['rows']
+                elif batch['status'] == BATCH_CANCELLED:
+                    summary['cancelled'] += 1
+                else:
+                    summary['failed'] += 1
+
+            # Remove the checkpoint once every batch is complete so a later migration starts over
+            if summary['failed'] == 0 and summary['cancelled'] == 0:
+                os.remove(checkpoint_path)
+
+            self.logger.info(
+                'DDAEHiveToIcebergMigration::migrate_ddae_hive_table()::Migration finished:\n' +
+                tabulate([summary], headers='keys', tablefmt='psql'))
+
+        except Exception as e:
+            self.logger.error('DDAEHiveToIcebergMigration::migrate_ddae_hive_table()::The following unexpected '
+                              'exception occurred: ' + str(e) + "\n" + traceback.format_exc())
+            summary['error'] = str(e)
+
+        return summary
+
+    def plan_batches(self, source_table):
+        """
+        Returns the list of WHERE clause predicates the migration is split into
+        """
+        sepsession = self.sepsession.sep_session
+
+        # One batch per Hive partition
+        if self.partition_column:
+            table_parts = source_table.split('.')
+            partition_type = self.get_column_type(source_table, self.partition_column)
+            sqlString = "SELECT DISTINCT {0} FROM {1}.{2}.\"{3}$partitions\"".format(
+                self.partition_column, table_parts[0], table_parts[1], table_parts[2])
+            return [self.get_equality_predicate(self.partition_column, partition_type, row[0])
+                    for row in sepsession.sql(sqlString).collect()]
+
+        # Without a partition or key column the table is migrated in a single batch
+        if not self.key_column:
+            return ['TRUE']
+
+        # Split the key column into evenly sized ranges, the last range is inclusive of the maximum
+        key_type = self.get_column_type(source_table, self.key_column)
+        if key_type not in INTEGER_TYPES:
+            raise DDAEException('The migration key column ' + self.key_column + ' must be an integer column, it is ' +
+                                str(key_type))
+
+        sqlString = "SELECT min({0}), max({0}) FROM {1}".format(self.key_column, source_table)
+        row = sepsession.sql(sqlString).collect()[0]
+        predicates = ["{0} IS NULL".format(self.key_column)]
+        if row[0] is None:
+            return predicates
+
+        low_key, high_key = int(row[0]), int(row[1])
+        step = max(1, -(-(high_key - low_key + 1) // self.batch_count))
+        for range_start in range(low_key, high_key + 1, step):
+            range_end = range_start + step
+            if range_end > high_key:
+                predicates.append("{0} BETWEEN {1} AND {2}".format(self.key_column, range_start, high_key))
+            else:
+                predicates.append("{0} >= {1} AND {0} < {2}".format(self.key_column, range_start, range_end))
+        return predicates
+
+    def migrate_batch(self, source_table, target_table, predicate):
+        """
+        Copy and verify a single batch on its own session and return the checkpoint entry for it
+        """
+        # Batches that have not started are left for the next run once a shutdown has been requested
+        if self.shutdown is not None and self.shutdown.kill_now:
+            return {'status': BATCH_CANCELLED, 'rows': 0}
+
+        batch_session = self.sepsession.clone()
+        batch_session.connect()
+        try:
+            if batch_session.sep_session is None:
+                raise Exception('Unable to create a DDAE Session for the batch')
+
+            sepsession = batch_session.sep_session
+
+            # Clear any rows left behind by an earlier, interrupted attempt at this batch
+            sepsession.sql("DELETE FROM {0} WHERE {1}".format(target_table, predicate)).collect()
+            sepsession.sql("INSERT INTO {0} SELECT * FROM {1} WHERE {2}".format(
+                target_table, source_table, predicate)).collect()
+
+            # Verify the row counts match
+            source_rows = int(sepsession.sql("SELECT count(*) FROM {0} WHERE {1}".format(
+                source_table, predicate)).collect()[0][0])
+            target_rows = int(sepsession.sql("SELECT count(*) FROM {0} WHERE {1}".format(
+                target_table, predicate)).collect()[0][0])
+
+            if source_rows != target_rows:
+                self.logger.error(
+                    'DDAEHiveToIcebergMigration::migrate_batch()::Row count mismatch for batch ' + predicate +
+                    ': source ' + str(source_rows) + ', target ' + str(target_rows))
+                return {'status': BATCH_FAILED, 'rows': target_rows}
+
+            self.logger.info(
+                'DDAEHiveToIcebergMigration::migrate_batch()::Migrated ' + str(target_rows) + ' rows for batch ' + predicate)
+            return {'status': BATCH_COMPLETE, 'rows': target_rows}
+
+        except Exception as e:
+            self.logger.error('DDAEHiveToIcebergMigration::migrate_batch()::The following unexpected '
+                              'exception occurred for batch ' + predicate + ': ' + str(e) + "\n" + traceback.format_exc())
+            return {'status': BATCH_FAILED, 'rows': 0}
+
+        finally:
+            if batch_session.sep_session is not None:
+                batch_session.disconnect()
+
+    def get_checkpoint_path(self, target_table):
+        return os.path.join(self.configuration.tempfilepath, 'migration_' + target_table.replace('.', '_') + '.json')
+
+    def load_checkpoint(self, checkpoint_path, source_table, target_table):
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path, 'r') as f:
+                checkpoint = json.load(f)
+            if checkpoint.get('source') == source_table:
+                self.logger.info(
+                    'DDAEHiveToIcebergMigration::load_checkpoint()::Resuming migration from checkpoint ' + checkpoint_path)
+                return checkpoint
+
+        return {'source': source_table, 'target': target_table, 'plan': None, 'batches': {}}
+
+    def save_checkpoint(self, checkpoint_path, checkpoint):
+        write_checkpoint_file(checkpoint_path, checkpoint)
+
+    def get_column_type(self, source_table, column):
+        """
+        Returns the Trino data type of the column in the source table
+        """
+        table_parts = source_table.split('.')
+        sqlString = ("SELECT data_type FROM {0}.information_schema.columns "
+                     "WHERE table_schema = '{1}' AND table_name = '{2}' AND column_name = '{3}'").format(
+            table_parts[0], table_parts[1], table_parts[2], column.lower())
+        rows = self.sepsession.sep_session.sql(sqlString).collect()
+        if len(rows) == 0:
+            raise DDAEException('The migration column ' + column + ' does not exist in ' + source_table)
+        return rows[0][0]
+
+    @staticmethod
+    def get_equality_predicate(column, column_type, value):
+        # Trino does not coerce varchar literals to date, timestamp, or decimal so the value is cast to the column type
+        if value is None:
+            return "{0} IS NULL".format(column)
+        return "{0} = CAST('{1}' AS {2})".format(column, str(value).replace("'", "''"), column_type)
@@ -0,0 +1,104 @@
+"""
+DELL Data Lakehouse / DDAE Demo - PyStarburst and Object Lock Demo - Iceberg Table Maintenance Runner
+"""
+import os
+import traceback
+import urllib3
+
+from configuration.dell_pystarburst_demo_configuration import DellPyStarburstDemoConfiguration
+from ddae.ddae import DDAEAuthentication
+from ddae.iceberg_maintenance import DDAEIcebergMaintenance
+from logger import dell_pystarburst_demo_logger
+from shutdown.dell_pystarburst_demo_shutdown import DellPyStarburstDemoShutdown
+
+# Constants
+MODULE_NAME = "Dell_PyStarburst_Demo_Maintenance_Module"  # Module Name
+CONFIG_FILE = 'dell_pystarburst_demo.json'  # Default Configuration File
+SECONDS_PER_HOUR = 60 * 60
+
+urllib3.disable_warnings()
+
+
+def get_maintenance_tables(configuration):
+    """
+    Returns the (catalog, schema, table) of every Iceberg table to maintain, the migration's Iceberg table
+    when no maintenance tables are configured
+    """
+    maintenance_tables = [maintenance_table.strip().split('.') for maintenance_table in
+                          str(configuration.ddae_iceberg_maintenance['maintenance_tables']).split(',')
+                          if maintenance_table.strip()]
+    if not maintenance_tables and configuration.ddae_iceberg_migration:
+        maintenance_tables = [[configuration.ddae_iceberg_migration['ddae_iceberg_catalog'],
+                               configuration.ddae_iceberg_migration['ddae_iceberg_schema'],
+                               configuration.ddae_table_name_customer]]
+    return maintenance_tables
+
+
+"""
+Main 
+"""
+if __name__ == "__main__":
+
+    try:
+        # Create object to support controlled shutdown
+        controlledShutdown = DellPyStarburstDemoShutdown()
+
+        # Dump out application path
+        currentApplicationDirectory = os.getcwd()
+        configFilePath = os.path.abspath(os.path.join(currentApplicationDirectory, "configuration", CONFIG_FILE))
+        tempFilePath = os.path.abspath(os.path.join(currentApplicationDirectory, "temp"))
+
+        print(MODULE_NAME + "::__main__::Current directory is : " + currentApplicationDirectory)
+        print(MODULE_NAME + "::__main__::Configuration file path is: " + configFilePath)
+
+        # Load and validate module configuration
+        configuration = DellPyStarburstDemoConfiguration(configFilePath, tempFilePath)
+        logger = dell_pystarburst_demo_logger.get_logger(__name__, configuration.logging_level)
+        controlledShutdown.configure(configuration.shutdown_drain_timeout, logger)
+        maintenance_tables = get_maintenance_tables(configuration)
+        interval_seconds = int(configuration.ddae_iceberg_maintenance['maintenance_interval_hours']) * SECONDS_PER_HOUR
+
+        if not maintenance_tables:
+            print(MODULE_NAME + "::__main__::No Iceberg tables to maintain, configure maintenance_tables or "
+                                "DDAE_ICEBERG_MIGRATION")
+        else:
+            sep = DDAEAuthentication(configuration.ddaesession['protocol'],
+                                     configuration.ddaesession['host'], configuration.ddaesession['user'],
+                                     configuration.ddaesession['password'],
+                                     configuration.ddaesession['port'],
+                                     configuration.ddaesession['catalog'],
+                                     configuration.ddaesession['schema'], logger)
+            sep.connect()
+
+            if sep.sep_session is None:
+                logger.error(MODULE_NAME + '::__main__::Unable to create a DDAE Session as configured.  '
+                                           'Please validate and try again.')
+            else:
+                # Running maintenance queries of the session are killed on a controlled shutdown
+                controlledShutdown.register_session(sep)
+                maintenance = DDAEIcebergMaintenance(configuration, sep, logger, controlledShutdown)
+
+                # Maintain every table, then wait for the next run when an interval is configured
+                while not controlledShutdown.kill_now:
+                    for catalog, schema, table_name in maintenance_tables:
+                        if controlledShutdown.kill_now:
+                            break
+                        maintenance_report = maintenance.maintain_ddae_iceberg_table(catalog, schema, table_name)
+                        print(MODULE_NAME + "::__main__::Iceberg maintenance report: " + str(maintenance_report))
+
+                    if interval_seconds == 0:
+                        break
+                    print(MODULE_NAME + "::__main__::Next maintenance run in " +
+                          configuration.ddae_iceberg_maintenance['maintenance_interval_hours'] + " hours")
+                    controlledShutdown.sleep(interval_seconds)
+
+                # Give a controlled shutdown the chance to finish cancelling queries
+                controlledShutdown.wait_for_drain()
+
+                print(MODULE_NAME + "::__main__::Closing DDAE / Starburst session")
+                logger.info("__main__::Closing DDAE / Starburst session")
+                sep.disconnect()
+
+    except Exception as e:
+        print(MODULE_NAME + '__main__::The following unexpected error occurred: '
+              + str(e) + "\n" + traceback.format_exc())
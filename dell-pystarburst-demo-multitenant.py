@@ -0,0 +1,66 @@
+"""
+DELL Data Lakehouse / DDAE Demo - PyStarburst and Object Lock Demo - Multi-Tenant Scenario Runner
+"""
+import os
+import time
+import traceback
+import urllib3
+
+from configuration.dell_pystarburst_demo_configuration import DellPyStarburstDemoConfiguration
+from logger import dell_pystarburst_demo_logger
+from scenario.dell_pystarburst_demo_tenants import run_tenants, get_timing_report
+from shutdown.dell_pystarburst_demo_shutdown import DellPyStarburstDemoShutdown
+
+# Constants
+MODULE_NAME = "Dell_PyStarburst_Demo_MultiTenant_Module"  # Module Name
+CONFIG_FILE = 'dell_pystarburst_demo.json'  # Default Configuration File
+
+urllib3.disable_warnings()
+
+
+"""
+Main 
+"""
+if __name__ == "__main__":
+
+    try:
+        # Create object to support controlled shutdown, the parent tells each tenant process to drain its own work
+        controlledShutdown = DellPyStarburstDemoShutdown()
+
+        # Dump out application path
+        currentApplicationDirectory = os.getcwd()
+        configFilePath = os.path.abspath(os.path.join(currentApplicationDirectory, "configuration", CONFIG_FILE))
+        tempFilePath = os.path.abspath(os.path.join(currentApplicationDirectory, "temp"))
+        test_hive_data = os.path.abspath(os.path.join(currentApplicationDirectory, "testdata",
+                                                      "20240716_195545_07788_nxv46_b7038b63-56dc-4c8e-8b2d-595a2e2a4a84"))
+
+        print(MODULE_NAME + "::__main__::Current directory is : " + currentApplicationDirectory)
+        print(MODULE_NAME + "::__main__::Configuration file path is: " + configFilePath)
+
+        # Load and validate module configuration, each tenant process loads and derives its own copy
+        configuration = DellPyStarburstDemoConfiguration(configFilePath, tempFilePath)
+        logger = dell_pystarburst_demo_logger.get_logger(__name__, configuration.logging_level)
+        # The parent waits up to the drain timeout for the tenants to drain before it reports them as cancelled
+        controlledShutdown.configure(configuration.shutdown_drain_timeout, logger,
+                                     2 * configuration.shutdown_drain_timeout)
+        tenant_count = int(configuration.multi_tenant['tenant_count'])
+        max_workers = int(configuration.multi_tenant['max_workers'])
+
+        print(MODULE_NAME + "::__main__::Running the demo scenario for " + str(tenant_count) + " tenants with " +
+              str(max_workers) + " worker processes")
+        logger.info(MODULE_NAME + "::__main__::Running the demo scenario for " + str(tenant_count) + " tenants with " +
+                    str(max_workers) + " worker processes")
+
+        start_time = time.monotonic()
+        results = run_tenants(configFilePath, tempFilePath, test_hive_data, tenant_count, max_workers, MODULE_NAME,
+                              controlledShutdown)
+        timing_report = get_timing_report(results, time.monotonic() - start_time)
+
+        print(timing_report)
+        logger.info(MODULE_NAME + "::__main__::Multi-tenant timing report:\n" + timing_report)
+
+        controlledShutdown.wait_for_drain()
+
+    except Exception as e:
+        print(MODULE_NAME + '__main__::The following unexpected error occurred: '
+              + str(e) + "\n" + traceback.format_exc())
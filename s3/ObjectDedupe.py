@@ -0,0 +1,57 @@
+import hashlib
+import math
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+# Uploads use an explicit transfer configuration so the ETag of a multipart upload can be recomputed locally
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+MULTIPART_CHUNKSIZE = 8 * 1024 * 1024
+MEGABYTE = 1024 * 1024
+
+
+def getTransferConfig() -> TransferConfig:
+    return TransferConfig(multipart_threshold=MULTIPART_THRESHOLD, multipart_chunksize=MULTIPART_CHUNKSIZE)
+
+
+def getLocalETag(file_path, part_size=None):
+    # A single part upload's ETag is the MD5 of the object.  A multipart upload's ETag is the MD5 of the
+    # concatenated part MD5s followed by -<number of parts>.
+    if part_size is None:
+        md5 = hashlib.md5()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(MEGABYTE), b''):
+                md5.update(block)
+        return md5.hexdigest()
+
+    part_digests = []
+    with open(file_path, 'rb') as f:
+        for part in iter(lambda: f.read(part_size), b''):
+            part_digests.append(hashlib.md5(part).digest())
+    return hashlib.md5(b''.join(part_digests)).hexdigest() + '-' + str(len(part_digests))
+
+
+def objectMatchesLocalFile(s3, bucket, key, file_path, file_size) -> bool:
+    # Returns True when the object exists with the same size and ETag as the local file so the upload can be skipped
+    try:
+        response = s3.head_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ['404', 'NoSuchKey', 'NotFound']:
+            return False
+        raise
+
+    if response['ContentLength'] != file_size:
+        return False
+
+    remote_etag = response['ETag'].strip('"')
+    if '-' not in remote_etag:
+        return remote_etag == getLocalETag(file_path)
+
+    # The part size is not recorded on the object so try the configured chunk size and the
+    # chunk size the transfer manager would have grown to for this number of parts
+    part_count = int(remote_etag.split('-')[1])
+    part_sizes = [MULTIPART_CHUNKSIZE, int(math.ceil(float(file_size) / part_count / MEGABYTE)) * MEGABYTE]
+    for part_size in part_sizes:
+        if int(math.ceil(float(file_size) / part_size)) == part_count and remote_etag == getLocalETag(file_path, part_size):
+            return True
+    return False
@@ -0,0 +1,344 @@
+"""
+DELL Data Lakehouse / DDAE Demo - PyStarburst and Object Lock Demo Scenario
+"""
+import os
+import time
+import traceback
+
+from botocore.exceptions import ClientError
+
+from ddae.ddae import DDAEDataProcessor, DDAEException
+from ddae.iceberg_maintenance import DDAEIcebergMaintenance
+from ddae.migration import DDAEHiveToIcebergMigration
+from s3 import ObjectDedupe
+from scenario.dell_pystarburst_demo_state import DellPyStarburstDemoState
+
+SCENARIO_COMPLETE = 'complete'
+SCENARIO_FAILED = 'failed'
+SCENARIO_CANCELLED = 'cancelled'
+
+OBJECT_LOCK_RULE = {
+    'DefaultRetention': {
+        'Mode': 'GOVERNANCE',
+        'Days': 1
+    }
+}
+
+
+def get_bucket_and_prefix(table_location):
+    """
+    Split a s3a://bucket/prefix/ table location into its bucket and key prefix
+    """
+    location = table_location.split('://', 1)[-1]
+    bucket, _, prefix = location.partition('/')
+    return bucket, prefix
+
+
+class DellPyStarburstDemoScenario(object):
+    """
+    Runs the ingest, query, lock, restore, and purge demo cycle against the bucket, catalog, schema,
+    and table in the configuration, timing every step
+
+    Completed steps are checkpointed to a state file in the temporary file storage path.  Steps with a
+    postcondition (bucket, object lock, table, and upload) are skipped whenever it already holds, the
+    remaining steps are skipped on a rerun until the first step that has to be run again.
+    """
+
+    def __init__(self, configuration, sepsession, s3, test_data_path, logger, module_name, shutdown=None):
+        self.configuration = configuration
+        self.sepsession = sepsession
+        self.s3 = s3
+        self.test_data_path = test_data_path
+        self.logger = logger
+        self.module_name = module_name
+        self.shutdown = shutdown
+        self.ddaeDataProcessor = DDAEDataProcessor(configuration, sepsession, logger, shutdown)
+
+        # The test data is stored under the Hive table location in the lakehouse bucket
+        _, table_prefix = get_bucket_and_prefix(configuration.ddae_table_location)
+        self.test_data_key = table_prefix + configuration.ddae_table_name_customer + '/' + os.path.basename(test_data_path)
+        self.delete_object_response = None
+        self.timings = {}
+        self.state = DellPyStarburstDemoState(
+            os.path.join(configuration.tempfilepath, 'pipeline_' + configuration.dell_lakehouse_s3_bucket + '.json'), logger)
+
+    def get_steps(self):
+        """
+        Returns the ordered list of (step name, step method) making up the scenario
+        """
+        steps = [('create_bucket', self.create_bucket),
+                 ('configure_object_lock', self.configure_object_lock),
+                 ('create_hive_table', self.create_hive_table),
+                 ('upload_test_data', self.upload_test_data),
+                 ('query_data', self.query_data)]
+        if self.configuration.ddae_iceberg_migration:
+            steps.append(('migrate_to_iceberg', self.migrate_to_iceberg))
+        steps += [('delete_test_data', self.delete_test_data),
+                  ('query_deleted_data', self.query_data),
+                  ('restore_test_data', self.restore_test_data),
+                  ('query_restored_data', self.query_data)]
+        if self.configuration.ddae_iceberg_migration:
+            steps.append(('drop_iceberg_table', self.drop_iceberg_table))
+        steps += [('purge_bucket', self.purge_bucket),
+                  ('delete_bucket', self.delete_bucket),
+                  ('drop_hive_table', self.drop_hive_table)]
+        return steps
+
+    def get_postconditions(self):
+        """
+        Returns the checks that tell whether a step's work is already in place, keyed by step name
+        """
+        return {'create_bucket': self.is_bucket_created,
+                'configure_object_lock': self.is_object_lock_configured,
+                'create_hive_table': self.is_hive_table_created,
+                'upload_test_data': self.is_test_data_uploaded}
+
+    def run(self):
+        """
+        Run every step of the scenario and return a result with the status, the timings in seconds of the steps
+        that were run, and the steps that were skipped
+        """
+        bucket = self.configuration.dell_lakehouse_s3_bucket
+        result = {'bucket': bucket, 'status': SCENARIO_COMPLETE, 'timings': self.timings, 'skipped': []}
+        postconditions = self.get_postconditions()
+        resuming = True
+        start_time = time.monotonic()
+
+        for step_name, step in self.get_steps():
+            # Stop before the next step once a shutdown has been requested
+            if self.shutdown is not None and self.shutdown.kill_now:
+                self.logger.info('DellPyStarburstDemoScenario::run()::Controlled shutdown requested, stopping before step ' +
+                                 step_name + ' for bucket ' + bucket)
+                result['status'] = SCENARIO_CANCELLED
+                result['cancelled_step'] = step_name
+                break
+
+            step_start = time.monotonic()
+            skip_step = False
+            try:
+                if step_name in postconditions:
+                    skip_step = self.check_postcondition(step_name, postconditions[step_name])
+                else:
+                    skip_step = resuming and self.state.is_complete(step_name)
+
+                if skip_step:
+                    print(self.module_name + '::DellPyStarburstDemoScenario::run()::Skipping step ' + step_name + ', it is already complete')
+                    self.logger.info('DellPyStarburstDemoScenario::run()::Skipping step ' + step_name + ' for bucket ' +
+                                     bucket + ', it is already complete')
+                    result['skipped'].append(step_name)
+                    self.state.mark_complete(step_name)
+                    continue
+
+                # Once a step has to be run again the checkpoints of the steps after it no longer apply
+                resuming = False
+                self.logger.info('DellPyStarburstDemoScenario::run()::Starting step ' + step_name + ' for bucket ' + bucket)
+                step()
+                self.state.mark_complete(step_name)
+            except Exception as e:
+                self.logger.error('DellPyStarburstDemoScenario::run()::The following unexpected exception occurred in step ' +
+                                  step_name + ': ' + str(e) + "\n" + traceback.format_exc())
+                print(self.module_name + '::DellPyStarburstDemoScenario::run()::Step ' + step_name + ' failed: ' + str(e))
+                if self.shutdown is not None and self.shutdown.kill_now:
+                    result['status'] = SCENARIO_CANCELLED
+                    result['cancelled_step'] = step_name
+                else:
+                    result['status'] = SCENARIO_FAILED
+                    result['failed_step'] = step_name
+                break
+            finally:
+                # Skipped steps are reported in result['skipped'] so they do not skew the step timings
+                if not skip_step:
+                    self.timings[step_name] = round(time.monotonic() - step_start, 3)
+
+        # The last steps remove everything the scenario created so the next run starts from the beginning
+        if result['status'] == SCENARIO_COMPLETE:
+            self.state.clear()
+
+        result['total'] = round(time.monotonic() - start_time, 3)
+        return result
+
+    def check_postcondition(self, step_name, postcondition):
+        try:
+            return postcondition()
+        except Exception as e:
+            self.logger.debug('DellPyStarburstDemoScenario::check_postcondition()::Unable to check the postcondition of step ' +
+                              step_name + ', it will be run: ' + str(e))
+            return False
+
+    def is_bucket_created(self):
+        bucket = self.configuration.dell_lakehouse_s3_bucket
+        self.s3.head_bucket(Bucket=bucket)
+        versioning = self.s3.get_bucket_versioning(Bucket=bucket)
+        object_lock = self.s3.get_object_lock_configuration(Bucket=bucket)['ObjectLockConfiguration']
+        return versioning.get('Status') == 'Enabled' and object_lock.get('ObjectLockEnabled') == 'Enabled'
+
+    def is_object_lock_configured(self):
+        object_lock = self.s3.get_object_lock_configuration(Bucket=self.configuration.dell_lakehouse_s3_bucket)
+        return object_lock['ObjectLockConfiguration'].get('Rule') == OBJECT_LOCK_RULE
+
+    def is_hive_table_created(self):
+        configuration = self.configuration
+        return self.ddaeDataProcessor.ddae_table_exists(configuration.ddae_catalog, configuration.ddae_schema,
+                                                        configuration.ddae_table_name_customer)
+
+    def is_test_data_uploaded(self):
+        return ObjectDedupe.objectMatchesLocalFile(self.s3, self.configuration.dell_lakehouse_s3_bucket, self.test_data_key,
+                                                   self.test_data_path, os.path.getsize(self.test_data_path))
+
+    # 1. Create version enabled and object lock enabled bucket in our object store
+    def create_bucket(self):
+        bucket = self.configuration.dell_lakehouse_s3_bucket
+        self.s3.create_bucket(Bucket=bucket, ObjectLockEnabledForBucket=True)
+        self.s3.put_bucket_versioning(Bucket=bucket, VersioningConfiguration={'Status': 'Enabled'})
+
+        # Check Object Lock Configuration
+        ol_bucket_response = self.s3.get_object_lock_configuration(Bucket=bucket)
+        print(
+            self.module_name + "__main__::Bucket " + bucket + " created with versioning and object lock enabled.  Object Lock Configuration before creating Governance rule:")
+        print(ol_bucket_response)
+
+    # 2. Create an object lock rule on the bucket
+    def configure_object_lock(self):
+        bucket = self.configuration.dell_lakehouse_s3_bucket
+        self.s3.put_object_lock_configuration(
+            Bucket=bucket,
+            ObjectLockConfiguration={
+                'ObjectLockEnabled': 'Enabled',
+                'Rule': OBJECT_LOCK_RULE
+            }
+        )
+        print(
+            self.module_name + "__main__::Bucket " + bucket + " Added object lock rule to bucket.  Object Lock Configuration after creation of Governance rule:")
+        print(self.s3.get_object_lock_configuration(Bucket=bucket))
+
+    # 3. Create Schema and Table in Hive with PyStarburst
+    def create_hive_table(self):
+        configuration = self.configuration
+        print(
+            self.module_name + "__main__::Create the following catalog, schema, and table: " + configuration.ddae_catalog + "." + configuration.ddae_schema + "." + configuration.ddae_table_name_customer)
+        self.ddaeDataProcessor.create_ddae_hive_table(configuration.ddae_catalog, configuration.ddae_schema,
+                                                      configuration.ddae_table_name_customer,
+                                                      configuration.ddae_table_location,
+                                                      configuration.ddae_table_schema_customer)
+
+    # 4. Write parquet data to the bucket
+    def upload_test_data(self):
+        print(self.module_name + "__main__::About to add the following test data to the Data Lakehouse S3 Bucket:")
+        self.logger.info('__main__::About to add the following test data to the Data Lakehouse S3 Bucket:')
+        try:
+            print(self.module_name + "__main__::\t " + self.test_data_path)
+            self.logger.info('__main__::\t' + self.test_data_path)
+            if self.shutdown is None:
+                self.s3.upload_file(self.test_data_path, self.configuration.dell_lakehouse_s3_bucket, self.test_data_key,
+                                    Config=ObjectDedupe.getTransferConfig())
+            else:
+                # Register the upload so a controlled shutdown can abort it if it is still in progress
+                self.shutdown.register_upload(self.s3, self.configuration.dell_lakehouse_s3_bucket, self.test_data_key)
+                try:
+                    self.s3.upload_file(self.test_data_path, self.configuration.dell_lakehouse_s3_bucket,
+                                        self.test_data_key, Callback=self.shutdown.transfer_callback,
+                                        Config=ObjectDedupe.getTransferConfig())
+                finally:
+                    self.shutdown.unregister_upload(self.s3, self.configuration.dell_lakehouse_s3_bucket, self.test_data_key)
+        except ClientError as e:
+            # Fail the step so a missing object is never checkpointed as uploaded
+            self.logger.error('DellPyStarburstDemoScenario::upload_test_data()::Unable to upload the test data: ' + str(e))
+            raise DDAEException('Unable to upload ' + self.test_data_path + ': ' + str(e))
+
+    # 5, 7, and 9. Perform DDAE Query against the bucket via PyStarburst
+    def query_data(self):
+        configuration = self.configuration
+        print(self.module_name + "__main__::Starting query of customer data in the DDAE using PyStarburst")
+        self.ddaeDataProcessor.get_customer_data(configuration.ddae_catalog, configuration.ddae_schema,
+                                                 configuration.ddae_table_name_customer, self.module_name)
+
+    # 5a. Migrate the Hive table to Iceberg and run Iceberg table maintenance against it
+    def migrate_to_iceberg(self):
+        configuration = self.configuration
+        iceberg_catalog = configuration.ddae_iceberg_migration['ddae_iceberg_catalog']
+        iceberg_schema = configuration.ddae_iceberg_migration['ddae_iceberg_schema']
+        print(self.module_name + "__main__::Migrating customer data to the following Iceberg table: " + iceberg_catalog + "." + iceberg_schema + "." + configuration.ddae_table_name_customer)
+        migration = DDAEHiveToIcebergMigration(configuration, self.sepsession, self.logger, self.shutdown)
+        migration_summary = migration.migrate_ddae_hive_table(configuration.ddae_catalog, configuration.ddae_schema,
+                                                              configuration.ddae_table_name_customer,
+                                                              iceberg_catalog, iceberg_schema,
+                                                              configuration.ddae_iceberg_migration['ddae_iceberg_table_location'],
+                                                              configuration.ddae_table_schema_customer)
+        print(self.module_name + "__main__::Migration summary: " + str(migration_summary))
+
+        # The step fails, and is not checkpointed, unless every batch was migrated
+        if 'error' in migration_summary or migration_summary['failed'] or migration_summary['cancelled']:
+            raise DDAEException('The migration to Iceberg did not complete: ' + str(migration_summary))
+
+        # The completed migration is kept, its checkpoint is gone, so a shutdown only skips the maintenance
+        if self.shutdown is not None and self.shutdown.kill_now:
+            self.logger.info('DellPyStarburstDemoScenario::migrate_to_iceberg()::Controlled shutdown requested, '
+                             'skipping Iceberg table maintenance')
+            return
+
+        maintenance = DDAEIcebergMaintenance(configuration, self.sepsession, self.logger, self.shutdown)
+        maintenance_report = maintenance.maintain_ddae_iceberg_table(iceberg_catalog, iceberg_schema,
+                                                                     configuration.ddae_table_name_customer)
+        print(self.module_name + "__main__::Iceberg maintenance report: " + str(maintenance_report))
+
+    # 6. Delete the parquet file in the bucket
+    def delete_test_data(self):
+        self.delete_object_response = self.s3.delete_object(Bucket=self.configuration.dell_lakehouse_s3_bucket,
+                                                            Key=self.test_data_key)
+        print(
+            self.module_name + "__main__::Deleting Parquet file: " + self.test_data_key + ".  Since versioning is enabled we get a delete marker for the object created AND the object is locked with Governance due to the rule we created.")
+        self.logger.info(
+            '__main__::Deleting Parquet file: ' + self.test_data_key + '.  Since versioning is enabled we get a delete marker for the object created AND the object is locked with Governance due to the rule we created.')
+
+    # 8. Restore the deleted object version by deleting the delete marker
+    def restore_test_data(self):
+        version_id = self.delete_object_response['VersionId']
+        print(
+            self.module_name + "__main__::Delete the Delete Marker for the Parquet file: " + self.test_data_key + ' with version id ' +
+            version_id + ".  This will restore the object.")
+        self.logger.info(
+            "__main__::Deleting the Delete Marker for Parquet file: " + self.test_data_key + ' with version id ' +
+            version_id + ".  This will restore the object.")
+        self.s3.delete_object(Bucket=self.configuration.dell_lakehouse_s3_bucket, Key=self.test_data_key,
+                              VersionId=version_id, BypassGovernanceRetention=True)
+
+    # 9a. Drop the Iceberg table and schema with PyStarburst so their files are purged with the bucket
+    def drop_iceberg_table(self):
+        configuration = self.configuration
+        iceberg_catalog = configuration.ddae_iceberg_migration['ddae_iceberg_catalog']
+        iceberg_schema = configuration.ddae_iceberg_migration['ddae_iceberg_schema']
+        print(self.module_name + "__main__::Drop the following Iceberg table: " + iceberg_catalog + "." + iceberg_schema + "." + configuration.ddae_table_name_customer)
+        self.ddaeDataProcessor.drop_ddae_table(iceberg_catalog, iceberg_schema, configuration.ddae_table_name_customer)
+        self.ddaeDataProcessor.drop_ddae_schema(iceberg_catalog, iceberg_schema)
+
+        # The drops log and swallow their errors so check the table and schema are gone before the step is checkpointed
+        if self.ddaeDataProcessor.ddae_table_exists(iceberg_catalog, iceberg_schema, configuration.ddae_table_name_customer):
+            raise DDAEException('The Iceberg table ' + configuration.ddae_table_name_customer + ' was not dropped')
+        if self.ddaeDataProcessor.ddae_schema_exists(iceberg_catalog, iceberg_schema):
+            raise DDAEException('The Iceberg schema ' + iceberg_catalog + '.' + iceberg_schema + ' was not dropped')
+
+    # 10. Delete all object versions and delete markers in the bucket
+    def purge_bucket(self):
+        bucket = self.configuration.dell_lakehouse_s3_bucket
+        print(self.module_name + "__main__::Starting to delete all object versions and delete markers in the bucket")
+        list_object_versions_response = self.s3.list_object_versions(Bucket=bucket)
+        for obj_version in list_object_versions_response.get('Versions', []) + list_object_versions_response.get('DeleteMarkers', []):
+            # Stop sending deletes once a shutdown has been requested, the rerun purges what is left
+            if self.shutdown is not None:
+                self.shutdown.check()
+            self.s3.delete_object(Bucket=bucket, Key=obj_version['Key'], VersionId=obj_version['VersionId'],
+                                  BypassGovernanceRetention=True)
+
+    # 11. Delete bucket
+    def delete_bucket(self):
+        print(self.module_name + "__main__::Deleting the bucket")
+        self.s3.delete_bucket(Bucket=self.configuration.dell_lakehouse_s3_bucket)
+
+    # 12. Drop Table and Schema with PyStarburst
+    def drop_hive_table(self):
+        configuration = self.configuration
+        print(self.module_name + "__main__::Drop the following table: " + configuration.ddae_catalog + "." + configuration.ddae_schema + "." + configuration.ddae_table_name_customer)
+        self.ddaeDataProcessor.drop_ddae_table(configuration.ddae_catalog, configuration.ddae_schema, configuration.ddae_table_name_customer)
+
+        print(self.module_name + "__main__::Drop the following schema: " + configuration.ddae_catalog + "." + configuration.ddae_schema)
+        self.ddaeDataProcessor.drop_ddae_schema(configuration.ddae_catalog, configuration.ddae_schema)
@@ -0,0 +1,44 @@
+"""
+DELL Data Lakehouse / DDAE Demo - Pipeline Step Checkpoints
+"""
+import json
+import os
+import time
+
+from ddae.checkpoint import write_checkpoint_file
+
+
+class DellPyStarburstDemoState(object):
+    """
+    Stores completed pipeline steps in a local JSON state file so a rerun after a partial failure
+    can resume where the previous run stopped
+    """
+
+    def __init__(self, state_path, logger):
+        self.state_path = state_path
+        self.logger = logger
+        self.state = {'steps': {}}
+
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, 'r') as f:
+                    self.state = json.load(f)
+                self.logger.info('DellPyStarburstDemoState::Loaded pipeline checkpoints from ' + state_path)
+            except Exception as e:
+                self.logger.error('DellPyStarburstDemoState::Ignoring unreadable pipeline state file ' + state_path +
+                                  ': ' + str(e))
+
+    def is_complete(self, step_name):
+        return step_name in self.state['steps']
+
+    def mark_complete(self, step_name):
+        self.state['steps'][step_name] = {'completed_at': time.strftime('%Y-%m-%dT%H:%M:%S')}
+        self.save()
+
+    def clear(self):
+        self.state = {'steps': {}}
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+
+    def save(self):
+        write_checkpoint_file(self.state_path, self.state)
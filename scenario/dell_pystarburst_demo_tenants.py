@@ -0,0 +1,210 @@
+"""
+DELL Data Lakehouse / DDAE Demo - Multi-Tenant Scenario Runner
+"""
+import copy
+import multiprocessing
+import signal
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from tabulate import tabulate
+
+from configuration.dell_pystarburst_demo_configuration import DellPyStarburstDemoConfiguration
+from ddae.ddae import DDAEAuthentication
+from logger import dell_pystarburst_demo_logger
+from s3 import GetConnection
+from scenario.dell_pystarburst_demo_scenario import DellPyStarburstDemoScenario, SCENARIO_COMPLETE, SCENARIO_FAILED, \
+    SCENARIO_CANCELLED, get_bucket_and_prefix
+from shutdown.dell_pystarburst_demo_shutdown import DellPyStarburstDemoShutdown, DRAIN_POLL_INTERVAL
+
+TENANT_LOG_FILE_NAME = "dell-pystarburst_demo_tenant_{0:03d}.log"
+
+# Set in each tenant process from the parent's stop event
+_stop_event = None
+
+
+def get_tenant_location(table_location, bucket):
+    """
+    Returns the table location moved to the tenant's bucket, keeping the configured scheme and key prefix
+    """
+    _, prefix = get_bucket_and_prefix(table_location)
+    scheme = table_location.split('://', 1)[0] + '://' if '://' in table_location else ''
+    return scheme + bucket + '/' + prefix
+
+
+def get_tenant_configuration(configuration, tenant_number):
+    """
+    Returns a copy of the configuration with the bucket, schemas, table, and table locations derived for the tenant
+    """
+    tenant_configuration = copy.copy(configuration)
+    bucket_suffix = '-t{0:03d}'.format(tenant_number)
+    name_suffix = '_t{0:03d}'.format(tenant_number)
+
+    tenant_configuration.dell_lakehouse_s3_bucket = configuration.dell_lakehouse_s3_bucket + bucket_suffix
+    tenant_configuration.ddae_schema = configuration.ddae_schema + name_suffix
+    tenant_configuration.ddae_table_name_customer = configuration.ddae_table_name_customer + name_suffix
+
+    tenant_configuration.ddae_table_location = get_tenant_location(configuration.ddae_table_location,
+                                                                   tenant_configuration.dell_lakehouse_s3_bucket)
+
+    if configuration.ddae_iceberg_migration:
+        tenant_configuration.ddae_iceberg_migration = dict(configuration.ddae_iceberg_migration)
+        tenant_configuration.ddae_iceberg_migration['ddae_iceberg_schema'] += name_suffix
+        tenant_configuration.ddae_iceberg_migration['ddae_iceberg_table_location'] = get_tenant_location(
+            configuration.ddae_iceberg_migration['ddae_iceberg_table_location'], tenant_configuration.dell_lakehouse_s3_bucket)
+
+    return tenant_configuration
+
+
+def get_empty_result(tenant_number, status):
+    """
+    Returns the result of a tenant that did not report one of its own
+    """
+    return {'tenant': tenant_number, 'status': status, 'timings': {}, 'skipped': [], 'total': 0.0}
+
+
+def init_tenant_process(stop_event):
+    global _stop_event
+
+    # Idle worker processes ignore the shutdown signals so they do not break the pool, run_tenant handles them while running.
+    # A SIGTERM sent only to the parent, e.g. by Kubernetes or systemd, reaches running tenants through the stop event.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    _stop_event = stop_event
+
+
+def run_tenant(config, temp_dir, test_data_path, tenant_number, module_name):
+    """
+    Run the demo scenario for a single tenant with its own configuration, logger, session, and S3 client.
+    This is executed in a worker process so everything is created here rather than passed in.
+    """
+    result = get_empty_result(tenant_number, SCENARIO_FAILED)
+    start_time = time.monotonic()
+    logger = None
+
+    shutdown = DellPyStarburstDemoShutdown(stop_event=_stop_event)
+
+    try:
+        configuration = get_tenant_configuration(DellPyStarburstDemoConfiguration(config, temp_dir), tenant_number)
+        logger = dell_pystarburst_demo_logger.get_logger(module_name + '_tenant_{0:03d}'.format(tenant_number),
+                                                         configuration.logging_level,
+                                                         TENANT_LOG_FILE_NAME.format(tenant_number))
+        shutdown.configure(configuration.shutdown_drain_timeout, logger)
+
+        sep = DDAEAuthentication(configuration.ddaesession['protocol'],
+                                 configuration.ddaesession['host'], configuration.ddaesession['user'],
+                                 configuration.ddaesession['password'],
+                                 configuration.ddaesession['port'],
+                                 configuration.ddaesession['catalog'],
+                                 configuration.ddaesession['schema'], logger)
+        sep.connect()
+        if sep.sep_session is None:
+            logger.error('run_tenant()::Unable to create a DDAE Session as configured for tenant ' + str(tenant_number))
+            return result
+        shutdown.register_session(sep)
+
+        s3endpoint = configuration.dells3connection['protocol'] + "://" + configuration.dells3connection[
+            'host'] + ":" + configuration.dells3connection['port']
+        s3 = GetConnection.getConnection(s3endpoint, False, configuration.dells3connection['s3AccessKey'],
+                                         configuration.dells3connection['s3SecretKey'])
+
+        try:
+            scenario = DellPyStarburstDemoScenario(configuration, sep, s3, test_data_path, logger,
+                                                   module_name + '[tenant {0:03d}]'.format(tenant_number), shutdown)
+            result.update(scenario.run())
+        finally:
+            shutdown.wait_for_drain()
+            sep.disconnect()
+
+    except Exception as e:
+        if logger is not None:
+            logger.error('run_tenant()::The following unexpected exception occurred for tenant ' + str(tenant_number) +
+                         ': ' + str(e) + "\n" + traceback.format_exc())
+        result['error'] = str(e)
+
+    result['total'] = round(time.monotonic() - start_time, 3)
+    return result
+
+
+def run_tenants(config, temp_dir, test_data_path, tenant_count, max_workers, module_name, shutdown=None):
+    """
+    Run the demo scenario for tenant_count tenants concurrently in a process pool and return their results.
+    On a controlled shutdown tenants that have not started are cancelled and running tenants are told to drain
+    through the stop event.  Tenants still running once the drain timeout has passed are reported as cancelled.
+    """
+    results = []
+    stop_event = multiprocessing.Event()
+    executor = ProcessPoolExecutor(max_workers=max_workers, initializer=init_tenant_process, initargs=(stop_event,))
+    try:
+        futures = {executor.submit(run_tenant, config, temp_dir, test_data_path, tenant_number, module_name): tenant_number
+                   for tenant_number in range(1, tenant_count + 1)}
+        if shutdown is not None:
+            shutdown.register_callback(stop_event.set)
+            shutdown.register_callback(lambda: [future.cancel() for future in futures])
+
+        pending = set(futures)
+        drain_deadline = None
+        while pending:
+            done, pending = wait(pending, timeout=DRAIN_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # A tenant process that dies, e.g. killed by the OOM killer, breaks the pool but not the report
+                    result = get_empty_result(futures[future], SCENARIO_FAILED)
+                    result['error'] = str(e) or type(e).__name__
+                print(module_name + "::run_tenants()::Tenant " + str(result['tenant']) + " finished with status " +
+                      result['status'] + " in " + str(result['total']) + " seconds")
+                results.append(result)
+
+            # Tenants see the stop event up to a poll interval after the parent's drain sets it
+            if shutdown is not None and shutdown.kill_now:
+                if drain_deadline is None:
+                    drain_deadline = time.monotonic() + shutdown.drain_timeout + 2 * DRAIN_POLL_INTERVAL
+                elif time.monotonic() >= drain_deadline:
+                    for future in pending:
+                        results.append(get_empty_result(futures[future], SCENARIO_CANCELLED))
+                    break
+    finally:
+        executor.shutdown(wait=shutdown is None or not shutdown.kill_now, cancel_futures=True)
+
+    return sorted(results, key=lambda tenant_result: tenant_result['tenant'])
+
+
+def get_timing_report(results, wall_clock_seconds):
+    """
+    Returns a report of the per tenant results and the min / avg / max time of every step across the tenants
+    that ran it, along with the number of tenants that skipped it
+    """
+    tenant_rows = [{'tenant': result['tenant'], 'bucket': result.get('bucket', ''), 'status': result['status'],
+                    'stopped_step': result.get('failed_step', result.get('cancelled_step', '')),
+                    'skipped': len(result['skipped']), 'total': result['total']} for result in results]
+
+    step_names = []
+    for result in results:
+        for step_name in list(result['timings']) + result['skipped']:
+            if step_name not in step_names:
+                step_names.append(step_name)
+
+    step_rows = []
+    for step_name in step_names + ['total']:
+        if step_name == 'total':
+            step_timings = [result['total'] for result in results]
+        else:
+            step_timings = [result['timings'][step_name] for result in results if step_name in result['timings']]
+        skipped = len([result for result in results if step_name in result['skipped']])
+        if not step_timings and not skipped:
+            continue
+        step_rows.append({'step': step_name, 'tenants': len(step_timings), 'skipped': skipped,
+                          'min': round(min(step_timings), 3) if step_timings else '',
+                          'avg': round(sum(step_timings) / len(step_timings), 3) if step_timings else '',
+                          'max': round(max(step_timings), 3) if step_timings else ''})
+
+    completed = len([result for result in results if result['status'] == SCENARIO_COMPLETE])
+    return (tabulate(tenant_rows, headers='keys', tablefmt='psql') + '\n' +
+            tabulate(step_rows, headers='keys', tablefmt='psql') + '\n' +
+            '{0} of {1} tenants completed in {2} seconds wall clock'.format(completed, len(results),
+                                                                            round(wall_clock_seconds, 3)))
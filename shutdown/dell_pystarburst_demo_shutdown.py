@@ -0,0 +1,186 @@
+"""
+DELL Data Lakehouse / DDAE Demo - PyStarburst and Object Lock Demo - Controlled Shutdown
+"""
+import os
+import signal
+import threading
+import time
+import traceback
+
+DEFAULT_DRAIN_TIMEOUT = 30  # In seconds
+DRAIN_POLL_INTERVAL = 0.5  # In seconds
+
+
+class DellPyStarburstDemoCancelled(Exception):
+    pass
+
+
+class DellPyStarburstDemoShutdown:
+    """
+    Handles SIGINT / SIGTERM by setting kill_now and draining in-flight work
+
+    Long running operations check kill_now before scheduling more work.  The drain runs on a background
+    thread and kills the Starburst queries of every registered session, aborts the registered in-progress
+    multipart uploads, and runs any registered shutdown callbacks.  The drain is bounded at the process level,
+    if the owner has not called wait_for_drain within the exit timeout of the signal the process exits.
+    """
+    kill_now = False
+
+    def __init__(self, drain_timeout=DEFAULT_DRAIN_TIMEOUT, logger=None, stop_event=None):
+        self.drain_timeout = drain_timeout
+        self.exit_timeout = drain_timeout
+        self.logger = logger
+        self.stop_event = stop_event
+        self.signum = signal.SIGTERM
+        self.closed = False
+        self.lock = threading.Lock()
+        self.sessions = []
+        self.uploads = []
+        self.callbacks = []
+
+        # The signal handler only sets kill_now, the drain thread polls for it.  The handler must not take any
+        # lock, including the one inside threading.Event.set(), since the interrupted main thread may hold it.
+        self.drained = threading.Event()
+        self.finished = threading.Event()
+        self.drain_thread = threading.Thread(target=self.wait_and_drain, name='dell-pystarburst-demo-drain', daemon=True)
+        self.drain_thread.start()
+
+        self.previous_handlers = {signal.SIGINT: signal.signal(signal.SIGINT, self.controlled_shutdown),
+                                  signal.SIGTERM: signal.signal(signal.SIGTERM, self.controlled_shutdown)}
+
+    def configure(self, drain_timeout, logger, exit_timeout=None):
+        self.drain_timeout = drain_timeout
+        self.exit_timeout = drain_timeout if exit_timeout is None else exit_timeout
+        self.logger = logger
+
+    def controlled_shutdown(self, signum, frame):
+        # A second signal gets the default handler and terminates the process
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self.signum = signum
+        self.kill_now = True
+
+    def check(self):
+        """
+        Raise DellPyStarburstDemoCancelled if a shutdown has been requested
+        """
+        if self.kill_now:
+            raise DellPyStarburstDemoCancelled('Cancelled by controlled shutdown')
+
+    def transfer_callback(self, bytes_transferred):
+        """
+        boto3 transfer Callback that fails the transfer once a shutdown has been requested so
+        the transfer manager stops sending parts and aborts the multipart upload
+        """
+        self.check()
+
+    def sleep(self, seconds):
+        """
+        Sleep for up to seconds, returning early once a shutdown has been requested
+        """
+        deadline = time.monotonic() + seconds
+        while not self.kill_now and time.monotonic() < deadline:
+            time.sleep(max(min(DRAIN_POLL_INTERVAL, deadline - time.monotonic()), 0))
+
+    def register_session(self, sepsession):
+        with self.lock:
+            self.sessions.append(sepsession)
+
+    def unregister_session(self, sepsession):
+        with self.lock:
+            if sepsession in self.sessions:
+                self.sessions.remove(sepsession)
+
+    def register_upload(self, s3, bucket, key):
+        with self.lock:
+            self.uploads.append((s3, bucket, key))
+
+    def unregister_upload(self, s3, bucket, key):
+        with self.lock:
+            if (s3, bucket, key) in self.uploads:
+                self.uploads.remove((s3, bucket, key))
+
+    def register_callback(self, callback):
+        with self.lock:
+            self.callbacks.append(callback)
+
+    def wait_and_drain(self):
+        # A stop event shared with a parent process stops this process the same way a signal does
+        while not self.kill_now:
+            if self.closed:
+                return
+            if self.stop_event is not None and self.stop_event.is_set():
+                self.kill_now = True
+                break
+            time.sleep(DRAIN_POLL_INTERVAL)
+
+        exit_deadline = time.monotonic() + self.exit_timeout
+        self.drain()
+        self.drained.set()
+
+        # Exit if the owner is still blocked, e.g. on a query the drain was unable to kill
+        if not self.finished.wait(max(exit_deadline - time.monotonic(), 0)):
+            self.log_info('DellPyStarburstDemoShutdown::wait_and_drain()::Work did not stop within ' +
+                          str(self.exit_timeout) + ' seconds of the controlled shutdown, exiting')
+            os._exit(128 + self.signum)
+
+    def drain(self):
+        deadline = time.monotonic() + self.drain_timeout
+        self.log_info('DellPyStarburstDemoShutdown::drain()::Controlled shutdown requested, draining for up to ' +
+                      str(self.drain_timeout) + ' seconds')
+
+        with self.lock:
+            callbacks = list(self.callbacks)
+            sessions = list(self.sessions)
+            uploads = list(self.uploads)
+
+        for callback in callbacks:
+            self.run_drain_task(callback)
+
+        for sepsession in sessions:
+            if time.monotonic() >= deadline:
+                break
+            self.run_drain_task(sepsession.cancel_queries)
+
+        for s3, bucket, key in uploads:
+            if time.monotonic() >= deadline:
+                break
+            self.run_drain_task(self.abort_multipart_uploads, s3, bucket, key)
+
+        self.log_info('DellPyStarburstDemoShutdown::drain()::Drain complete')
+
+    def wait_for_drain(self):
+        """
+        Wait for the drain, if one was started, for no longer than the drain timeout.  The owner's work is
+        finished at this point so the process is no longer forced to exit and the signal handlers are restored.
+        """
+        if self.kill_now:
+            self.drained.wait(self.drain_timeout)
+        self.close()
+
+    def close(self):
+        self.closed = True
+        self.finished.set()
+        if threading.current_thread() is threading.main_thread():
+            for signum, handler in self.previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def abort_multipart_uploads(self, s3, bucket, key):
+        response = s3.list_multipart_uploads(Bucket=bucket, Prefix=key)
+        for upload in response.get('Uploads', []):
+            if upload['Key'] == key:
+                self.log_info('DellPyStarburstDemoShutdown::abort_multipart_uploads()::Aborting multipart upload of ' +
+                              bucket + '/' + key)
+                s3.abort_multipart_upload(Bucket=bucket, Key=key, UploadId=upload['UploadId'])
+
+    def run_drain_task(self, task, *args):
+        try:
+            task(*args)
+        except Exception as e:
+            if self.logger is not None:
+                self.logger.error('DellPyStarburstDemoShutdown::drain()::The following unexpected '
+                                  'exception occurred: ' + str(e) + "\n" + traceback.format_exc())
+
+    def log_info(self, msg):
+        if self.logger is not None:
+            self.logger.info(msg)